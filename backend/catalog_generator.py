@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Synthetic catalog and spin-history generator for StreamRoulette benchmarks.
+
+Produces movies with skewed (Zipf-like) genre, mood and title-word
+distributions, a realistic rating spread and a release-year curve weighted
+toward recent years, plus spin results shaped like the /api/spin payload.
+Every movie is a pure function of (seed, index), so catalogs of millions of
+movies can be streamed without holding them in memory, and spins can
+reference them by index.
+
+Usage:
+    python catalog_generator.py --movies 1000000 --spins 200000 --drop
+    uvicorn server:app
+
+Server startup only seeds an empty movies collection, so a generated catalog
+is served as is. Without --drop, generated ids continue after the highest
+existing numeric id, so they never collide with movies already in the store.
+"""
+
+import argparse
+import itertools
+import logging
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+# Ordered from most to least common so Zipf weights land on the right names
+GENRES = [
+    "Drama", "Comedy", "Action", "Thriller", "Romance", "Crime", "Adventure", "Horror",
+    "Sci-Fi", "Family", "Fantasy", "Mystery", "Animation", "Biography", "History",
+    "Documentary", "Musical", "War", "Sport", "Western",
+]
+
+MOODS = [
+    "Emotional", "Thrilling", "Dark", "Uplifting", "Romantic", "Intense", "Quirky", "Epic",
+    "Suspenseful", "Mind-bending", "Nostalgic", "Whimsical", "Heroic", "Thought-provoking",
+    "Dreamy", "Classic",
+]
+
+TITLE_WORDS = [
+    "The", "Last", "Night", "City", "Dark", "Love", "Man", "Girl", "Dead", "House", "Lost",
+    "World", "Return", "Secret", "Blood", "Story", "Day", "King", "Road", "Dream", "Home",
+    "Star", "Shadow", "Fire", "Heart", "Game", "River", "Storm", "Summer", "Ghost",
+]
+
+TITLE_SYLLABLES = ["ka", "ro", "mi", "tel", "var", "en", "dor", "li", "sa", "gon", "ith", "ur", "bel", "quin", "zan"]
+
+# Number of genres/moods per movie and how often each occurs
+LABELS_PER_MOVIE = [1, 2, 3]
+LABELS_PER_MOVIE_WEIGHTS = [0.45, 0.4, 0.15]
+
+ZIPF_EXPONENT = 1.1
+WHEEL_SIZE = 8
+
+DUPLICATE_KEY_ERROR = 11000
+
+def zipf_cum_weights(size: int, exponent: float = ZIPF_EXPONENT):
+    """Cumulative Zipf weights for ranks 1..size"""
+    return list(itertools.accumulate(1 / rank ** exponent for rank in range(1, size + 1)))
+
+def build_vocabulary(names, size: int, prefix: str):
+    """Take the first size names, padding with numbered ones past the end of the list"""
+    return list(names[:size]) + [f"{prefix} {k}" for k in range(len(names) + 1, size + 1)]
+
+def build_title_words(size: int):
+    """Real title words first, then pronounceable made-up ones"""
+    words = TITLE_WORDS[:size]
+    for syllables in itertools.product(TITLE_SYLLABLES, repeat=3):
+        if len(words) >= size:
+            break
+        words.append("".join(syllables).capitalize())
+    return words
+
+class CatalogGenerator:
+    """Deterministic generator of synthetic movies and spin results"""
+
+    def __init__(self, seed: int = 0, genre_vocab: int = len(GENRES), mood_vocab: int = len(MOODS),
+                 title_vocab: int = 2000, start_id: int = 1, newest_year: int = 2024):
+        self.seed = seed
+        self.start_id = start_id
+        self.newest_year = newest_year
+        self.genres = build_vocabulary(GENRES, genre_vocab, "Genre")
+        self.moods = build_vocabulary(MOODS, mood_vocab, "Mood")
+        self.title_words = build_title_words(title_vocab)
+        self._genre_weights = zipf_cum_weights(len(self.genres))
+        self._mood_weights = zipf_cum_weights(len(self.moods))
+        self._title_weights = zipf_cum_weights(len(self.title_words))
+
+    def _rng(self, stream: int, index: int):
+        # String seeds are hashed whole, so distinct (seed, stream, index) never share a sequence
+        return random.Random(f"{self.seed}:{stream}:{index}")
+
+    def _labels(self, rng, vocab, cum_weights):
+        k = rng.choices(LABELS_PER_MOVIE, LABELS_PER_MOVIE_WEIGHTS)[0]
+        # Dedupe while keeping the draw order, so popular labels tend to come first
+        return list(dict.fromkeys(rng.choices(vocab, cum_weights=cum_weights, k=k)))
+
+    def movie(self, index: int):
+        """The movie at index; the same (seed, index) always gives the same movie"""
+        rng = self._rng(0, index)
+        movie_id = str(self.start_id + index)
+        words = rng.choices(self.title_words, cum_weights=self._title_weights, k=rng.randint(1, 4))
+        title = " ".join(words)
+        if rng.random() < 0.05:
+            title += f" {rng.randint(2, 5)}"
+        rating = round(min(10.0, max(1.0, rng.gauss(6.5, 1.1))), 1)
+        year = max(1920, self.newest_year - int(rng.expovariate(1 / 15)))
+        genres = self._labels(rng, self.genres, self._genre_weights)
+        moods = self._labels(rng, self.moods, self._mood_weights)
+        article = "An" if moods[0][0] in "AEIOU" else "A"
+        return {
+            "id": movie_id,
+            "title": title,
+            "genre": genres,
+            "mood": moods,
+            "rating": rating,
+            "description": f"{article} {moods[0].lower()} {genres[0].lower()} story from {year}.",
+            "year": year,
+            "poster_url": f"https://placehold.co/300x450?text={movie_id}",
+            "trailer_url": None,
+            "imdb_rating": round(min(10.0, max(1.0, rating + rng.gauss(0, 0.4))), 1),
+        }
+
+    def movies(self, count: int, offset: int = 0):
+        """Stream count movies starting at index offset"""
+        return (self.movie(index) for index in range(offset, offset + count))
+
+    def spin(self, index: int, catalog_size: int, days: int = 365):
+        """A spin result over a catalog of catalog_size movies, favouring popular (low-index) ones"""
+        rng = self._rng(1, index)
+
+        def popular_index():
+            return min(catalog_size - 1, int(catalog_size * rng.random() ** 3))
+
+        wheel_size = min(WHEEL_SIZE, catalog_size)
+        wheel_indexes = []
+        while len(wheel_indexes) < wheel_size:
+            candidate = popular_index()
+            if candidate not in wheel_indexes:
+                wheel_indexes.append(candidate)
+        wheel_movies = [self.movie(i) for i in wheel_indexes]
+        return {
+            "spin_id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "selected_movie": rng.choice(wheel_movies),
+            "wheel_movies": wheel_movies,
+            "timestamp": datetime(2024, 1, 1) + timedelta(seconds=rng.randrange(days * 86400)),
+        }
+
+    def spins(self, count: int, catalog_size: int):
+        """Stream count spin results over a catalog of catalog_size movies"""
+        if not catalog_size:
+            return iter(())
+        return (self.spin(index, catalog_size) for index in range(count))
+
+def insert_in_batches(collection, documents, batch_size: int = 10000, label: str = "documents",
+                      skip_duplicates: bool = False):
+    """Stream documents into collection with unordered bulk inserts; return the number written.
+
+    With skip_duplicates, documents whose _id is already taken are skipped
+    rather than failing the insert.
+    """
+    written = 0
+    started = time.perf_counter()
+    while True:
+        batch = list(itertools.islice(documents, batch_size))
+        if not batch:
+            break
+        try:
+            collection.insert_many(batch, ordered=False)
+            written += len(batch)
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            if not skip_duplicates or any(error.get("code") != DUPLICATE_KEY_ERROR for error in errors):
+                raise
+            written += e.details.get("nInserted", 0)
+        if written % (batch_size * 10) == 0:
+            elapsed = time.perf_counter() - started
+            logger.info(f"Inserted {written} {label} ({written / elapsed:.0f}/s)")
+    return written
+
+def next_movie_id(collection) -> int:
+    """One past the highest numeric movie id in collection (1 when it is empty)"""
+    pipeline = [{"$group": {"_id": None, "max_id": {"$max": {
+        "$convert": {"input": "$id", "to": "long", "onError": 0, "onNull": 0}
+    }}}}]
+    result = list(collection.aggregate(pipeline))
+    return int(result[0]["max_id"] or 0) + 1 if result else 1
+
+def main():
+    """Generate a catalog and spin history straight into the configured MongoDB"""
+    from dotenv import load_dotenv
+    from pymongo import MongoClient
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic StreamRoulette catalog")
+    parser.add_argument("--movies", type=int, default=10000, help="Number of movies to generate")
+    parser.add_argument("--spins", type=int, default=0, help="Number of spin results to generate")
+    parser.add_argument("--seed", type=int, default=0, help="Seed; the same seed gives the same catalog")
+    parser.add_argument("--genres", type=int, default=len(GENRES), help="Genre vocabulary size")
+    parser.add_argument("--moods", type=int, default=len(MOODS), help="Mood vocabulary size")
+    parser.add_argument("--title-words", type=int, default=2000, help="Title word vocabulary size")
+    parser.add_argument("--start-id", type=int, default=None,
+                        help="Id of the first generated movie (default: after the highest existing id)")
+    parser.add_argument("--batch-size", type=int, default=10000, help="Documents per insert_many")
+    parser.add_argument("--drop", action="store_true", help="Delete existing movies and spins first")
+    args = parser.parse_args()
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    client = MongoClient(os.getenv("MONGO_URL", "mongodb://localhost:27017"))
+    db = client[os.getenv("DB_NAME", "streamroulette")]
+
+    if args.drop:
+        db.movies.delete_many({})
+        db.spins.delete_many({})
+
+    start_id = args.start_id if args.start_id is not None else next_movie_id(db.movies)
+    generator = CatalogGenerator(args.seed, args.genres, args.moods, args.title_words, start_id)
+    started = time.perf_counter()
+    movies = insert_in_batches(db.movies, generator.movies(args.movies), args.batch_size, "movies")
+    spins = insert_in_batches(db.spins, generator.spins(args.spins, args.movies), args.batch_size, "spins")
+    elapsed = time.perf_counter() - started
+    logger.info(f"Generated {movies} movies (ids {start_id}-{start_id + movies - 1}) and {spins} spins in {elapsed:.1f}s")
+    # Running servers cache catalog-derived data; restart them to pick up the new catalog
+    client.close()
+
+if __name__ == "__main__":
+    main()
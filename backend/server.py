@@ -1,34 +1,36 @@
-from fastapi import FastAPI, HTTPException, Query
+import time
+
+# Cold-start clock, started before the heavier imports below
+STARTUP_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, JSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
 import os
 from dotenv import load_dotenv
+from catalog_generator import CatalogGenerator, insert_in_batches
 from pymongo import MongoClient
+from pymongo.errors import AutoReconnect, ExecutionTimeout
+from pymongo import monitoring
+from starlette.concurrency import run_in_threadpool
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import anyio.to_thread
+import asyncio
+import contextvars
+import hashlib
+import hmac
+import itertools
+import math
+import re
 import random
+import threading
 from datetime import datetime
 import uuid
 import logging
-from flask import Flask, send_from_directory, jsonify
-import os
-
-app = Flask(__name__, static_folder='frontend_build')
-
-@app.route('/api/ping')
-def ping():
-    return jsonify({"message": "pong"})
-
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
-def serve_react(path):
-    if path != "" and os.path.exists(os.path.join(app.static_folder, path)):
-        return send_from_directory(app.static_folder, path)
-    else:
-        return send_from_directory(app.static_folder, 'index.html')
-
-if __name__ == '__main__':
-    port = int(os.environ.get('PORT', 5000))
-    app.run(debug=False, host='0.0.0.0', port=port)
 
 # Load environment variables
 load_dotenv()
@@ -37,27 +39,199 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Startup
+# Seeding only fills an empty movies collection, so replicas starting against a
+# shared database never touch the catalog others are serving from
+SEED_DATABASE = os.getenv("SEED_DATABASE", "true").lower() == "true"
+SEED_CATALOG_SIZE = int(os.getenv("SEED_CATALOG_SIZE", "1000"))
+SEED_CATALOG_SEED = int(os.getenv("SEED_CATALOG_SEED", "0"))
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "10"))
+READINESS_TIMEOUT_SECONDS = float(os.getenv("READINESS_TIMEOUT_SECONDS", "1"))
+WARM_UP_MAX_BACKOFF_SECONDS = float(os.getenv("WARM_UP_MAX_BACKOFF_SECONDS", "30"))
+FRONTEND_BUILD_DIR = os.getenv("FRONTEND_BUILD_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend_build"))
+
+# Set once seeding and cache warm-up have finished
+startup_state = {"warmed": False, "cold_start_seconds": None}
+
+async def warm_up():
+    """Seed the catalog if configured and warm the catalog cache, off the startup path.
+
+    Retries with exponential backoff until it succeeds (e.g. while Mongo is
+    still coming up), so a transient failure does not leave the replica
+    permanently not-ready.
+    """
+    seeded = not SEED_DATABASE
+    backoff = 1.0
+    while True:
+        try:
+            if not seeded:
+                await run_in_threadpool(initialize_database)
+                seeded = True
+            await warm_catalog_cache()
+            break
+        except Exception as e:
+            logger.error(f"Error warming up, retrying in {backoff:.0f}s: {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, WARM_UP_MAX_BACKOFF_SECONDS)
+    startup_state["warmed"] = True
+    cold_start = time.perf_counter() - STARTUP_STARTED
+    startup_state["cold_start_seconds"] = round(cold_start, 3)
+    if cold_start > STARTUP_BUDGET_SECONDS:
+        logger.warning(f"Cold start took {cold_start:.2f}s, over the {STARTUP_BUDGET_SECONDS:.2f}s budget")
+    else:
+        logger.info(f"Ready to serve after {cold_start:.2f}s")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Connect to Mongo and start background work; the app takes traffic meanwhile"""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    connect_mongo()
+    tasks = [asyncio.create_task(warm_up())]
+    if DECKS_ENABLED:
+        tasks.append(asyncio.create_task(wheel_deck_producer()))
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        client.close()
+
 # Initialize FastAPI app
-app = FastAPI(title="StreamRoulette", description="Discover random movies based on your preferences")
+app = FastAPI(title="StreamRoulette", description="Discover random movies based on your preferences", lifespan=lifespan)
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Slow query log
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "100"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "50"))
+
+# Command name -> field holding the part of the command that determines its plan
+EXPLAINABLE_COMMANDS = {"find": "filter", "aggregate": "pipeline", "count": "query", "distinct": "query"}
+
+# Commands logged with a shape but never explained (getMore, insert, ... are logged without one)
+SHAPED_COMMANDS = {**EXPLAINABLE_COMMANDS, "delete": "deletes", "update": "updates", "findAndModify": "query"}
+
+# Driver-added fields that explain does not accept
+COMMAND_SESSION_FIELDS = {"lsid", "$db", "$clusterTime", "$readPreference", "txnNumber", "cursor"}
+
+def query_shape(value):
+    """Replace literal values with their type names, keeping operators and field names"""
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [query_shape(value[0])] if value else []
+    return type(value).__name__
+
+def summarize_plan(plan: dict) -> str:
+    """Render a winning plan as its chain of stages, e.g. FETCH <- IXSCAN(genre_1)"""
+    stages = []
+    while plan:
+        stage = plan.get("stage", "?")
+        if plan.get("indexName"):
+            stage += f"({plan['indexName']})"
+        stages.append(stage)
+        plan = plan.get("inputStage") or next(iter(plan.get("inputStages", [])), None)
+    return " <- ".join(stages)
+
+def find_query_planner(explain: dict):
+    """Locate the queryPlanner section, which aggregate nests inside its first stage"""
+    if "queryPlanner" in explain:
+        return explain["queryPlanner"]
+    for stage in explain.get("stages", []):
+        cursor = stage.get("$cursor", {})
+        if "queryPlanner" in cursor:
+            return cursor["queryPlanner"]
+    return None
+
+class SlowQueryListener(monitoring.CommandListener):
+    """Log Mongo commands slower than SLOW_QUERY_MS, failed or not, with their query shape and plan"""
+
+    def __init__(self, threshold_ms: float, explain: bool, log_size: int):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.recent = deque(maxlen=log_size)
+        self._started = {}
+        self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        # Slots for explains queued or running; driver threads take them, the explainer frees them
+        self._explain_slots = threading.BoundedSemaphore(2)
+
+    def started(self, event):
+        self._started[event.request_id] = (event.database_name, event.command)
+
+    def succeeded(self, event):
+        self._record(event, None)
+
+    def failed(self, event):
+        # Timeouts surface here, and they are the slowest queries of all
+        self._record(event, event.failure.get("errmsg") or str(event.failure))
+
+    def _record(self, event, error):
+        started = self._started.pop(event.request_id, None)
+        if started is None:
+            return
+        duration_ms = event.duration_micros / 1000
+        if duration_ms < self.threshold_ms:
+            return
+        database_name, command = started
+        name = event.command_name
+        collection = command.get(name)
+        entry = {
+            "command": name,
+            "collection": collection if isinstance(collection, str) else command.get("collection"),
+            "duration_ms": round(duration_ms, 1),
+            "shape": query_shape(command.get(SHAPED_COMMANDS[name], {})) if name in SHAPED_COMMANDS else None,
+            "plan": None,
+            "error": error,
+            "timestamp": datetime.now().isoformat(),
+        }
+        self.recent.append(entry)
+        outcome = f" failed: {error}" if error else ""
+        logger.warning(f"Slow query ({entry['duration_ms']} ms): {name} on {entry['collection']} shape={entry['shape']}{outcome}")
+        # Explain off the request path, and skip it rather than queue up behind a slow server
+        if self.explain and name in EXPLAINABLE_COMMANDS and self._explain_slots.acquire(blocking=False):
+            self._explainer.submit(self._explain, database_name, command, entry)
+
+    def _explain(self, database_name: str, command: dict, entry: dict):
+        try:
+            explained = {key: value for key, value in command.items() if key not in COMMAND_SESSION_FIELDS}
+            if entry["command"] == "aggregate":
+                explained["cursor"] = {}
+            result = client[database_name].command("explain", explained, verbosity="queryPlanner")
+            planner = find_query_planner(result)
+            if planner:
+                entry["plan"] = summarize_plan(planner.get("winningPlan", {}))
+                logger.warning(f"Slow query plan for {entry['command']} on {entry['collection']}: {entry['plan']}")
+        except Exception as e:
+            logger.error(f"Error explaining slow query: {e}")
+        finally:
+            self._explain_slots.release()
+
+slow_query_listener = SlowQueryListener(SLOW_QUERY_MS, SLOW_QUERY_EXPLAIN, SLOW_QUERY_LOG_SIZE)
 
 # MongoDB connection
 mongo_url = os.getenv("MONGO_URL", "mongodb://localhost:27017")
 db_name = os.getenv("DB_NAME", "streamroulette")
-client = MongoClient(mongo_url)
-db = client[db_name]
+mongo_timeout_ms = int(os.getenv("MONGO_TIMEOUT_MS", "5000"))
+
+# Set by connect_mongo() when the app starts
+client = None
+db = None
 
 # Collections
-movies_collection = db.movies
-spins_collection = db.spins
+movies_collection = None
+spins_collection = None
+
+def connect_mongo():
+    """Create the Mongo client and collection handles"""
+    global client, db, movies_collection, spins_collection
+    client = MongoClient(
+        mongo_url,
+        serverSelectionTimeoutMS=mongo_timeout_ms,
+        socketTimeoutMS=mongo_timeout_ms,
+        event_listeners=[slow_query_listener],
+    )
+    db = client[db_name]
+    movies_collection = db.movies
+    spins_collection = db.spins
 
 # Pydantic models
 class Movie(BaseModel):
@@ -77,6 +251,8 @@ class MovieFilter(BaseModel):
     moods: Optional[List[str]] = []
     min_rating: Optional[float] = 0.0
     max_year: Optional[int] = None
+    max_rating: Optional[float] = None
+    min_year: Optional[int] = None
 
 class SpinResult(BaseModel):
     spin_id: str
@@ -208,39 +384,37 @@ SAMPLE_MOVIES = [
     }
 ]
 
+# Bumped whenever the movie catalog changes so derived data can be discarded
+catalog_version = 0
+
+def invalidate_catalog():
+    """Mark everything derived from the movie catalog as stale"""
+    global catalog_version
+    catalog_version += 1
+
 # Initialize database with sample data
 def initialize_database():
-    """Initialize the database with sample movie data"""
+    """Seed an empty database with sample movie data"""
+    if movies_collection.find_one({}, {"_id": 1}) is not None:
+        logger.info("Movies collection already populated; skipping seed")
+        return
     try:
-        # Clear existing data
-        movies_collection.delete_many({})
-        
-        # Insert sample movies
-        movies_collection.insert_many(SAMPLE_MOVIES)
-        logger.info(f"Database initialized with {len(SAMPLE_MOVIES)} movies")
-        
-        # Create additional movies to reach 1000+
-        additional_movies = []
-        base_movies = SAMPLE_MOVIES[:10]  # Use first 10 as base
-        
-        for i in range(980):  # Create 980 more movies
-            base_movie = base_movies[i % len(base_movies)]
-            new_movie = base_movie.copy()
-            new_movie["id"] = str(21 + i)
-            new_movie["title"] = f"{base_movie['title']} {i + 1}"
-            new_movie["year"] = random.randint(1980, 2024)
-            new_movie["rating"] = round(random.uniform(6.0, 9.5), 1)
-            new_movie["imdb_rating"] = round(random.uniform(6.0, 9.5), 1)
-            additional_movies.append(new_movie)
-        
-        movies_collection.insert_many(additional_movies)
-        logger.info(f"Added {len(additional_movies)} additional movies")
+        invalidate_catalog()
+        # Sample movies first, then synthetic ones up to SEED_CATALOG_SIZE
+        generator = CatalogGenerator(seed=SEED_CATALOG_SEED, start_id=len(SAMPLE_MOVIES) + 1)
+        additional = max(0, SEED_CATALOG_SIZE - len(SAMPLE_MOVIES))
+        movies = itertools.chain(SAMPLE_MOVIES, generator.movies(additional))
+        # Seeded movies use their id as _id, so replicas seeding an empty database
+        # at the same moment skip each other's movies instead of doubling the catalog
+        added = insert_in_batches(movies_collection, ({"_id": movie["id"], **movie} for movie in movies),
+                                  label="movies", skip_duplicates=True)
+        logger.info(f"Database initialized with {added} movies")
         
     except Exception as e:
         logger.error(f"Error initializing database: {e}")
-
-# Initialize database on startup
-initialize_database()
+        raise
+    finally:
+        invalidate_catalog()
 
 # Helper functions
 def get_available_genres():
@@ -261,7 +435,8 @@ def get_available_moods():
     ]
     return [doc["_id"] for doc in movies_collection.aggregate(pipeline)]
 
-def filter_movies(genres: List[str] = None, moods: List[str] = None, min_rating: float = 0.0, max_year: int = None):
+def filter_movies(genres: List[str] = None, moods: List[str] = None, min_rating: float = 0.0, max_year: int = None,
+                  max_rating: float = None, min_year: int = None):
     """Filter movies based on criteria"""
     query = {}
     
@@ -271,45 +446,804 @@ def filter_movies(genres: List[str] = None, moods: List[str] = None, min_rating:
     if moods:
         query["mood"] = {"$in": moods}
     
-    if min_rating > 0:
-        query["rating"] = {"$gte": min_rating}
+    if min_rating and min_rating > 0:
+        query.setdefault("rating", {})["$gte"] = min_rating
+    
+    if max_rating is not None:
+        query.setdefault("rating", {})["$lte"] = max_rating
+    
+    if min_year:
+        query.setdefault("year", {})["$gte"] = min_year
     
     if max_year:
-        query["year"] = {"$lte": max_year}
+        query.setdefault("year", {})["$lte"] = max_year
     
     return list(movies_collection.find(query, {"_id": 0}))
 
+def filter_key(genres: List[str] = None, moods: List[str] = None, min_rating: float = 0.0, max_year: int = None,
+               max_rating: float = None, min_year: int = None):
+    """Normalize filter criteria into a hashable key, independent of order and duplicates"""
+    return (
+        tuple(sorted({g.strip() for g in genres or [] if g.strip()})),
+        tuple(sorted({m.strip() for m in moods or [] if m.strip()})),
+        float(min_rating or 0.0),
+        max_year or None,
+        float(max_rating) if max_rating is not None else None,
+        min_year or None,
+    )
+
+def compute_statistics():
+    """Count movies and spins and aggregate the most popular genres"""
+    total_movies = movies_collection.count_documents({})
+    total_spins = spins_collection.count_documents({})
+
+    # Get most popular genres
+    genre_pipeline = [
+        {"$unwind": "$genre"},
+        {"$group": {"_id": "$genre", "count": {"$sum": 1}}},
+        {"$sort": {"count": -1}},
+        {"$limit": 10}
+    ]
+    popular_genres = list(movies_collection.aggregate(genre_pipeline))
+
+    return {
+        "total_movies": total_movies,
+        "total_spins": total_spins,
+        "popular_genres": popular_genres
+    }
+
+def ping_mongo():
+    client.admin.command("ping")
+
+# Blocking calls timed for the request being profiled: (label, started, seconds), or None
+profile_spans = contextvars.ContextVar("profile_spans", default=None)
+
+def call_label(fn) -> str:
+    owner = getattr(fn, "__self__", None)
+    if getattr(owner, "name", None) and isinstance(owner.name, str):
+        return f"{owner.name}.{fn.__name__}"
+    return getattr(fn, "__qualname__", repr(fn))
+
+async def run_blocking(fn, *args):
+    """Run a blocking call in the threadpool, timing it when the request is being profiled.
+
+    The sampling profiler only sees the event-loop thread, so these spans are
+    the profile's only record of time spent in worker threads.
+    """
+    spans = profile_spans.get()
+    if spans is None:
+        return await run_in_threadpool(fn, *args)
+    started = time.perf_counter()
+    try:
+        return await run_in_threadpool(fn, *args)
+    finally:
+        spans.append((call_label(fn), started, time.perf_counter() - started))
+
+# Request coalescing
+class SingleFlight:
+    """Share one in-flight backend call between concurrent callers with the same key.
+
+    The first caller for a key starts the blocking call in the threadpool; callers
+    arriving while it is in flight await the same result instead of issuing an
+    identical query. Results are shared objects and must not be mutated.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.calls_by_kind = Counter()
+        self.coalesced_by_kind = Counter()
+
+    async def do(self, key: tuple, fn, *args):
+        """Run fn(*args) once per key among concurrent callers; key[0] names the kind of call"""
+        kind = key[0]
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            self.coalesced_by_kind[kind] += 1
+            spans = profile_spans.get()
+            if spans is not None:
+                started = time.perf_counter()
+                try:
+                    return await asyncio.shield(task)
+                finally:
+                    spans.append((f"coalesced wait on {kind} ({call_label(fn)})", started, time.perf_counter() - started))
+        else:
+            # The call runs as its own task so a cancelled caller (e.g. a dropped
+            # connection) never cancels it for the others waiting on the same key
+            task = asyncio.ensure_future(run_blocking(fn, *args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.calls += 1
+            self.calls_by_kind[kind] += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: tuple, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away
+            task.exception()
+
+    def metrics(self):
+        """Snapshot of backend calls issued and callers served by a shared call"""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+            "calls_by_kind": dict(self.calls_by_kind),
+            "coalesced_by_kind": dict(self.coalesced_by_kind),
+        }
+
+singleflight = SingleFlight()
+
+async def fetch_filtered_movies(genres: List[str] = None, moods: List[str] = None, min_rating: float = 0.0, max_year: int = None,
+                                max_rating: float = None, min_year: int = None):
+    """Filter movies, sharing the query with concurrent callers using the same criteria"""
+    key = filter_key(genres, moods, min_rating, max_year, max_rating, min_year)
+    genre_key, mood_key = key[:2]
+    return await singleflight.do(("filter",) + key, filter_movies, list(genre_key), list(mood_key), *key[2:])
+
+def get_fallback_movies():
+    """Movies to spin when nothing matches the filter"""
+    return list(movies_collection.find({}, {"_id": 0}).limit(100))
+
+async def load_wheel_candidates(key: tuple):
+    """Movies a wheel for the normalized filter key can be drawn from"""
+    filtered_movies = await fetch_filtered_movies(*key)
+    if not filtered_movies:
+        # If no movies match criteria, return random movies
+        filtered_movies = await singleflight.do(("fallback",), get_fallback_movies)
+    return filtered_movies
+
+def build_wheel(candidates: list, count: int):
+    """Sample a wheel of count movies from the candidates"""
+    if len(candidates) < count:
+        selected_movies = candidates
+    else:
+        selected_movies = random.sample(candidates, count)
+    return {
+        "movies": selected_movies,
+        "total_available": len(candidates)
+    }
+
+# Faceted counts
+class FacetIndex:
+    """In-memory bitset index over the facet fields of every movie.
+
+    Bit i of each bitset is set when movie i has that genre, mood, rating
+    (in tenths) or year, so a filter is a handful of ANDs/ORs and every
+    count is a popcount.
+    """
+
+    def __init__(self, movies):
+        genre_bytes, mood_bytes, rating_bytes, year_bytes = {}, {}, {}, {}
+        size = 0
+        rows = []
+        for movie in movies:
+            rows.append((movie.get("genre") or [], movie.get("mood") or [],
+                         round((movie.get("rating") or 0) * 10), movie.get("year")))
+            size += 1
+        self.size = size
+        width = (size + 7) // 8
+
+        def set_bit(table, value, i):
+            if value not in table:
+                table[value] = bytearray(width)
+            table[value][i >> 3] |= 1 << (i & 7)
+
+        for i, (genres, moods, rating, year) in enumerate(rows):
+            for genre in genres:
+                set_bit(genre_bytes, genre, i)
+            for mood in moods:
+                set_bit(mood_bytes, mood, i)
+            set_bit(rating_bytes, rating, i)
+            if year is not None:
+                set_bit(year_bytes, year, i)
+
+        def to_bits(table):
+            return {value: int.from_bytes(bits, "little") for value, bits in table.items()}
+
+        self.all = (1 << size) - 1
+        self.genres = to_bits(genre_bytes)
+        self.moods = to_bits(mood_bytes)
+        self.ratings = to_bits(rating_bytes)
+        self.years = to_bits(year_bytes)
+        # Histogram buckets: whole rating points and decades
+        self.rating_buckets = self._bucket(self.ratings, lambda tenths: tenths // 10)
+        self.year_buckets = self._bucket(self.years, lambda year: year // 10 * 10)
+
+    @staticmethod
+    def _bucket(bits_by_value, bucket_of):
+        buckets = {}
+        for value, bits in bits_by_value.items():
+            bucket = bucket_of(value)
+            buckets[bucket] = buckets.get(bucket, 0) | bits
+        return dict(sorted(buckets.items()))
+
+    def _any_of(self, bits_by_value, values):
+        if not values:
+            return self.all
+        mask = 0
+        for value in values:
+            mask |= bits_by_value.get(value, 0)
+        return mask
+
+    def _in_range(self, bits_by_value, low, high):
+        if low is None and high is None:
+            return self.all
+        mask = 0
+        for value, bits in bits_by_value.items():
+            if (low is None or value >= low) and (high is None or value <= high):
+                mask |= bits
+        return mask
+
+    def facets(self, genres, moods, min_rating=0.0, max_year=None, max_rating=None, min_year=None):
+        """Match counts for the filter, each facet counted with its own criterion left out.
+
+        Genre chips are OR-ed together, so a genre's count is how many movies
+        it contributes under the other criteria; likewise for moods and for
+        the rating/year histograms. Histogram buckets are half-open: a bucket
+        covers min <= value < max.
+        """
+        genre_mask = self._any_of(self.genres, genres)
+        mood_mask = self._any_of(self.moods, moods)
+        rating_mask = self._in_range(
+            self.ratings,
+            # Bounds between tenths round inward, matching Mongo's $gte/$lte on the raw rating
+            math.ceil(min_rating * 10 - 1e-9) if min_rating else None,
+            math.floor(max_rating * 10 + 1e-9) if max_rating is not None else None,
+        )
+        year_mask = self._in_range(self.years, min_year, max_year)
+
+        def counts(bits_by_value, mask):
+            return {value: (bits & mask).bit_count() for value, bits in bits_by_value.items()}
+
+        rating_counts = counts(self.rating_buckets, genre_mask & mood_mask & year_mask)
+        year_counts = counts(self.year_buckets, genre_mask & mood_mask & rating_mask)
+        return {
+            "total": (genre_mask & mood_mask & rating_mask & year_mask).bit_count(),
+            "genres": dict(sorted(counts(self.genres, mood_mask & rating_mask & year_mask).items())),
+            "moods": dict(sorted(counts(self.moods, genre_mask & rating_mask & year_mask).items())),
+            "rating_histogram": [
+                {"min": bucket, "max": bucket + 1, "count": count} for bucket, count in rating_counts.items()
+            ],
+            "year_histogram": [
+                {"min": bucket, "max": bucket + 10, "count": count} for bucket, count in year_counts.items()
+            ],
+        }
+
+def build_facet_index():
+    """Load the facet fields of the whole catalog into a FacetIndex"""
+    return FacetIndex(movies_collection.find({}, {"_id": 0, "genre": 1, "mood": 1, "rating": 1, "year": 1}))
+
+# Catalog cache: name -> loader for catalog-wide data served on every page load
+CATALOG_CACHE_LOADERS = {
+    "genres": get_available_genres,
+    "moods": get_available_moods,
+    "facet_index": build_facet_index,
+}
+
+# name -> (catalog version, value)
+catalog_cache = {}
+
+async def get_cached_catalog(name: str):
+    """Catalog-wide list for name, loaded once per catalog version"""
+    entry = catalog_cache.get(name)
+    if entry is not None and entry[0] == catalog_version:
+        return entry[1]
+    version = catalog_version
+    value = await singleflight.do((name,), CATALOG_CACHE_LOADERS[name])
+    if version == catalog_version:
+        catalog_cache[name] = (version, value)
+    return value
+
+async def warm_catalog_cache():
+    for name in CATALOG_CACHE_LOADERS:
+        await get_cached_catalog(name)
+
+def catalog_cache_warm() -> bool:
+    return all(
+        name in catalog_cache and catalog_cache[name][0] == catalog_version
+        for name in CATALOG_CACHE_LOADERS
+    )
+
+# Pre-shuffled wheel decks
+DECKS_ENABLED = os.getenv("DECKS_ENABLED", "true").lower() == "true"
+DECK_TOP_KEYS = int(os.getenv("DECK_TOP_KEYS", "16"))
+# Requests a key needs (within a decay interval) before it is worth a deck
+DECK_MIN_HITS = int(os.getenv("DECK_MIN_HITS", "5"))
+# Hits a key with a deck needs to keep it; lower than DECK_MIN_HITS so that halving
+# the counts on decay does not drop the deck of a key with steady traffic
+DECK_KEEP_HITS = int(os.getenv("DECK_KEEP_HITS", str(max(1, DECK_MIN_HITS // 2))))
+DECK_QUEUE_SIZE = int(os.getenv("DECK_QUEUE_SIZE", "32"))
+DECK_TRACKER_CAPACITY = int(os.getenv("DECK_TRACKER_CAPACITY", "256"))
+DECK_REFILL_INTERVAL = float(os.getenv("DECK_REFILL_INTERVAL_MS", "200")) / 1000
+DECK_DECAY_INTERVAL = float(os.getenv("DECK_DECAY_INTERVAL_SECONDS", "60"))
+
+class TopKeyTracker:
+    """Approximate top-N request keys with bounded memory (space-saving counters)"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._counts = {}
+
+    def record(self, key):
+        if key in self._counts:
+            self._counts[key] += 1
+        elif len(self._counts) < self.capacity:
+            self._counts[key] = 1
+        else:
+            # Replace the least frequent key, inheriting its count as the error bound
+            victim = min(self._counts, key=self._counts.get)
+            self._counts[key] = self._counts.pop(victim) + 1
+
+    def top(self, n: int, min_count: int = 1):
+        """The n most frequent keys seen at least min_count times"""
+        hot = [key for key, count in self._counts.items() if count >= min_count]
+        return sorted(hot, key=self._counts.get, reverse=True)[:n]
+
+    def count(self, key) -> int:
+        return self._counts.get(key, 0)
+
+    def decay(self):
+        """Halve all counts so the tracker follows shifts in traffic"""
+        self._counts = {key: count // 2 for key, count in self._counts.items() if count > 1}
+
+class WheelDecks:
+    """Bounded queues of ready-made wheels per (filter key, count)"""
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._decks = {}
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+
+    def __contains__(self, deck_key):
+        return deck_key in self._decks
+
+    def pop(self, deck_key):
+        """Take a ready wheel for deck_key, or None if there is no current one"""
+        queue = self._decks.get(deck_key)
+        while queue:
+            version, wheel = queue.popleft()
+            if version == catalog_version:
+                self.hits += 1
+                return wheel
+            self.discarded += 1
+        self.misses += 1
+        return None
+
+    def missing(self, deck_key) -> int:
+        """How many wheels deck_key is short of a full queue"""
+        queue = self._decks.get(deck_key)
+        return self.queue_size - len(queue) if queue else self.queue_size
+
+    def push(self, deck_key, version: int, wheel: dict):
+        queue = self._decks.setdefault(deck_key, deque(maxlen=self.queue_size))
+        queue.append((version, wheel))
+
+    def retain(self, deck_keys):
+        """Drop decks for keys that are no longer hot"""
+        for deck_key in list(self._decks):
+            if deck_key not in deck_keys:
+                self.discarded += len(self._decks.pop(deck_key))
+
+    def clear(self):
+        for queue in self._decks.values():
+            self.discarded += len(queue)
+        self._decks.clear()
+
+    def metrics(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "discarded": self.discarded,
+            "keys": len(self._decks),
+            "ready": sum(len(queue) for queue in self._decks.values()),
+        }
+
+deck_tracker = TopKeyTracker(DECK_TRACKER_CAPACITY)
+wheel_decks = WheelDecks(DECK_QUEUE_SIZE)
+
+async def refill_wheel_decks(candidate_cache: dict):
+    """Top up the decks of the hottest filter keys.
+
+    candidate_cache maps (filter key, catalog version) to the key's candidate
+    movies, so topping up a deck re-samples in memory rather than re-running
+    the filter query every round.
+    """
+    hot_keys = [
+        deck_key for deck_key in deck_tracker.top(DECK_TOP_KEYS, DECK_KEEP_HITS)
+        if deck_key in wheel_decks or deck_tracker.count(deck_key) >= DECK_MIN_HITS
+    ]
+    wheel_decks.retain(set(hot_keys))
+    hot_filters = {key for key, _ in hot_keys}
+    for key, version in list(candidate_cache):
+        if key not in hot_filters or version != catalog_version:
+            del candidate_cache[(key, version)]
+    for deck_key in hot_keys:
+        missing = wheel_decks.missing(deck_key)
+        if not missing:
+            continue
+        key, count = deck_key
+        version = catalog_version
+        candidates = candidate_cache.get((key, version))
+        if candidates is None:
+            candidates = await load_wheel_candidates(key)
+            if version != catalog_version:
+                # Catalog changed while loading; the next round starts from fresh data
+                return
+            candidate_cache[(key, version)] = candidates
+        for _ in range(missing):
+            wheel_decks.push(deck_key, version, build_wheel(candidates, count))
+
+async def wheel_deck_producer():
+    """Background task keeping decks full for popular filters"""
+    last_decay = time.monotonic()
+    seen_version = catalog_version
+    candidate_cache = {}
+    while True:
+        try:
+            if seen_version != catalog_version:
+                wheel_decks.clear()
+                seen_version = catalog_version
+            if time.monotonic() - last_decay >= DECK_DECAY_INTERVAL:
+                deck_tracker.decay()
+                last_decay = time.monotonic()
+            await refill_wheel_decks(candidate_cache)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error refilling wheel decks: {e}")
+        await asyncio.sleep(DECK_REFILL_INTERVAL)
+
+# Request profiling
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_SECRET = os.getenv("PROFILE_SECRET", "")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", "1")) / 1000
+# Oldest profiles are deleted beyond this many files
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "200"))
+# Longest lifetime accepted for a profiling signature
+PROFILE_SIGNATURE_MAX_TTL = int(os.getenv("PROFILE_SIGNATURE_MAX_TTL_SECONDS", "900"))
+
+def profile_signature(method: str, path: str, expires: int) -> str:
+    """X-Profile-Signature value that profiles requests to path until the unix time expires"""
+    message = f"{method} {path} {expires}".encode()
+    return f"{expires}:{hmac.new(PROFILE_SECRET.encode(), message, hashlib.sha256).hexdigest()}"
+
+def valid_profile_signature(signature: str, method: str, path: str) -> bool:
+    """Accept only unexpired signatures whose expiry is within PROFILE_SIGNATURE_MAX_TTL"""
+    expires, _, _ = signature.partition(":")
+    if not expires.isdigit():
+        return False
+    now = time.time()
+    if not now <= int(expires) <= now + PROFILE_SIGNATURE_MAX_TTL:
+        return False
+    return hmac.compare_digest(signature, profile_signature(method, path, int(expires)))
+
+def should_profile(request: Request) -> bool:
+    """Profile when sampled or when the request carries a valid signature"""
+    signature = request.headers.get("x-profile-signature")
+    if signature and PROFILE_SECRET:
+        return valid_profile_signature(signature, request.method, request.url.path)
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+def load_profiler():
+    """Import the sampling profiler on first use; it is an optional dependency"""
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        logger.warning("Request profiling requested but pyinstrument is not installed")
+        return None
+    return Profiler
+
+def format_spans(spans, started: float) -> str:
+    """Table of blocking calls, offset from the start of the request"""
+    lines = ["Worker-thread calls (wall time only; their stacks are not sampled):"]
+    if not spans:
+        lines.append("  none")
+    for label, span_started, seconds in sorted(spans, key=lambda span: span[1]):
+        lines.append(f"  +{(span_started - started) * 1000:8.1f} ms  {seconds * 1000:8.1f} ms  {label}")
+    return "\n".join(lines)
+
+def write_profile(profiler, request: Request, started: float, duration_ms: float, spans) -> str:
+    """Save the profile as text under PROFILE_DIR and return its file name"""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", request.url.path).strip("_")
+    name = f"{datetime.now():%Y%m%dT%H%M%S}-{request.method}-{slug}-{int(duration_ms)}ms-{uuid.uuid4().hex[:8]}.txt"
+    with open(os.path.join(PROFILE_DIR, name), "w") as f:
+        f.write(f"{request.method} {request.url.path} took {duration_ms:.1f} ms\n\n")
+        f.write(format_spans(spans, started) + "\n\n")
+        f.write("Event-loop thread (sampled):\n")
+        f.write(profiler.output_text(unicode=True, color=False))
+    prune_profiles()
+    return name
+
+def prune_profiles():
+    """Delete the oldest profiles so PROFILE_DIR keeps at most PROFILE_MAX_FILES"""
+    paths = [os.path.join(PROFILE_DIR, name) for name in os.listdir(PROFILE_DIR) if name.endswith(".txt")]
+    if len(paths) <= PROFILE_MAX_FILES:
+        return
+    paths.sort(key=os.path.getmtime)
+    for path in paths[:len(paths) - PROFILE_MAX_FILES]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # Another worker pruned it first
+            pass
+
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    """Wrap sampled or signed requests in a sampling profiler"""
+    if not request.url.path.startswith("/api/") or not should_profile(request):
+        return await call_next(request)
+
+    Profiler = load_profiler()
+    if Profiler is None:
+        return await call_next(request)
+
+    profiler = Profiler(interval=PROFILE_INTERVAL, async_mode="enabled")
+    spans = []
+    token = profile_spans.set(spans)
+    started = time.perf_counter()
+    profiler.start()
+    try:
+        response = await call_next(request)
+    finally:
+        profiler.stop()
+        profile_spans.reset(token)
+    duration_ms = (time.perf_counter() - started) * 1000
+    try:
+        name = await run_in_threadpool(write_profile, profiler, request, started, duration_ms, list(spans))
+        response.headers["X-Profile-Id"] = name
+    except Exception as e:
+        logger.error(f"Error writing profile: {e}")
+    return response
+
+# Admission control
+# Per-client token refill rate; 0 turns per-client rate limiting off
+RATE_LIMIT_PER_SECOND = float(os.getenv("RATE_LIMIT_PER_SECOND", "20"))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "40"))
+RATE_LIMIT_MAX_CLIENTS = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000"))
+# Number of reverse proxies in front of the app that append to X-Forwarded-For.
+# By default clients are identified by their socket address, since without a
+# proxy X-Forwarded-For is whatever the client chose to send. Behind an ingress
+# every request arrives from the proxy's address, so set this to the number of
+# proxies: the client is then the entry that many hops from the right.
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+RETRY_AFTER_SECONDS = int(os.getenv("RETRY_AFTER_SECONDS", "1"))
+
+# Route class -> (max concurrent requests, max queue wait in seconds)
+ROUTE_CLASS_LIMITS = {
+    "read": (int(os.getenv("CONCURRENCY_READ", "24")), float(os.getenv("QUEUE_BUDGET_READ_MS", "500")) / 1000),
+    "heavy": (int(os.getenv("CONCURRENCY_HEAVY", "8")), float(os.getenv("QUEUE_BUDGET_HEAVY_MS", "100")) / 1000),
+    "spin": (int(os.getenv("CONCURRENCY_SPIN", "32")), float(os.getenv("QUEUE_BUDGET_SPIN_MS", "2000")) / 1000),
+}
+
+# Worker threads for blocking Mongo calls. Every admitted request needs at most one,
+# plus headroom for background work (deck producer, warm-up, probes, profile writes),
+# so requests never queue for a thread where the queue budgets cannot see them.
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", str(sum(limit for limit, _ in ROUTE_CLASS_LIMITS.values()) + 8)))
+
+# Probes and metrics bypass admission control so overload stays observable
+ADMISSION_EXEMPT_PATHS = {"/api/health", "/api/health/live", "/api/health/ready", "/api/metrics"}
+
+# Mongo errors that mean the backend is slow or unreachable rather than broken
+BACKEND_BUSY_ERRORS = (AutoReconnect, ExecutionTimeout)
+
+def classify_route(method: str, path: str):
+    """Map a request to its (route class, priority)"""
+    if path == "/api/movies/random" or path.startswith("/api/spin"):
+        return "spin", "high"
+    if path == "/api/stats" or (method == "POST" and path == "/api/movies/filter"):
+        return "heavy", "low"
+    return "read", "normal"
+
+class TokenBucketLimiter:
+    """Per-client token buckets, keeping only the most recently seen clients"""
+
+    def __init__(self, rate: float, burst: float, max_clients: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+        self.rejected = 0
+
+    def acquire(self, client_id: str) -> float:
+        """Take a token for client_id; return 0 if allowed, else seconds until the next token"""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        tokens, last = self._buckets.pop(client_id, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - last) * self.rate)
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+        else:
+            wait = (1 - tokens) / self.rate
+            self.rejected += 1
+        self._buckets[client_id] = (tokens, now)
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return wait
+
+class ConcurrencyLimiter:
+    """Bound in-flight requests for a route class and shed those that queue too long"""
+
+    def __init__(self, limit: int, queue_budget: float):
+        self.limit = limit
+        self.queue_budget = queue_budget
+        self._semaphore = asyncio.Semaphore(limit)
+        self.waiting = 0
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = 0
+
+    async def acquire(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for a slot; return False if the request should be shed"""
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            self.shed += 1
+            return False
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        self.admitted += 1
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def metrics(self):
+        return {
+            "limit": self.limit,
+            "queue_budget_ms": int(self.queue_budget * 1000),
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
+
+rate_limiter = TokenBucketLimiter(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST, RATE_LIMIT_MAX_CLIENTS)
+route_limiters = {name: ConcurrencyLimiter(*limits) for name, limits in ROUTE_CLASS_LIMITS.items()}
+
+def client_id_for(request: Request) -> str:
+    """Identify the caller for rate limiting"""
+    if TRUSTED_PROXY_HOPS:
+        forwarded = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+        if forwarded:
+            return forwarded[-min(TRUSTED_PROXY_HOPS, len(forwarded))]
+    return request.client.host if request.client else "unknown"
+
+def overloaded_response(status_code: int, detail: str, retry_after: float):
+    """JSON error shaped like HTTPException responses, with a Retry-After hint"""
+    return JSONResponse(
+        status_code=status_code,
+        content={"detail": detail},
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+def api_error(e: Exception, detail: str):
+    """Translate an exception raised in a handler into the HTTPException to return"""
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, BACKEND_BUSY_ERRORS):
+        return HTTPException(
+            status_code=503,
+            detail="Service temporarily overloaded",
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+        )
+    return HTTPException(status_code=500, detail=detail)
+
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    """Rate limit per client and bound concurrency per route class, favouring spins"""
+    path = request.url.path
+    if not path.startswith("/api/") or path in ADMISSION_EXEMPT_PATHS or request.method == "OPTIONS":
+        return await call_next(request)
+
+    wait = rate_limiter.acquire(client_id_for(request))
+    if wait:
+        return overloaded_response(429, "Too many requests", wait)
+
+    route_class, priority = classify_route(request.method, path)
+    limiter = route_limiters[route_class]
+    # Low-priority work yields immediately while spins are queueing
+    if priority == "low" and route_limiters["spin"].waiting:
+        limiter.shed += 1
+        return overloaded_response(503, "Service temporarily overloaded", RETRY_AFTER_SECONDS)
+    if not await limiter.acquire(limiter.queue_budget):
+        return overloaded_response(503, "Service temporarily overloaded", RETRY_AFTER_SECONDS)
+    try:
+        return await call_next(request)
+    finally:
+        limiter.release()
+
+# CORS middleware (registered last so it also wraps responses shed by admission control)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
 # API Routes
 @app.get("/api/health")
+@app.get("/api/health/live")
 async def health_check():
-    """Health check endpoint"""
+    """Liveness probe: the process is up and serving requests"""
     return {"status": "healthy", "service": "StreamRoulette"}
 
+@app.get("/api/health/ready")
+async def readiness_check():
+    """Readiness probe: Mongo is reachable and the catalog cache is warm"""
+    checks = {"warmed_up": startup_state["warmed"], "catalog_cache": catalog_cache_warm()}
+    try:
+        await asyncio.wait_for(run_blocking(ping_mongo), READINESS_TIMEOUT_SECONDS)
+        checks["mongo"] = True
+    except Exception as e:
+        logger.warning(f"Readiness check could not reach Mongo: {e}")
+        checks["mongo"] = False
+    ready = all(checks.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not ready",
+            "checks": checks,
+            "cold_start_seconds": startup_state["cold_start_seconds"],
+        },
+    )
+
+@app.get("/api/metrics")
+async def get_metrics():
+    """Internal counters for request coalescing, wheel decks, admission control and slow queries"""
+    return {
+        "singleflight": singleflight.metrics(),
+        "wheel_decks": wheel_decks.metrics(),
+        "admission": {
+            "rate_limited": rate_limiter.rejected,
+            "route_classes": {name: limiter.metrics() for name, limiter in route_limiters.items()},
+        },
+        "slow_queries": list(slow_query_listener.recent),
+    }
+
 @app.get("/api/genres")
 async def get_genres():
     """Get all available genres"""
     try:
-        genres = get_available_genres()
+        genres = await get_cached_catalog("genres")
         return {"genres": genres}
     except Exception as e:
         logger.error(f"Error getting genres: {e}")
-        raise HTTPException(status_code=500, detail="Error retrieving genres")
+        raise api_error(e, "Error retrieving genres")
 
 @app.get("/api/moods")
 async def get_moods():
     """Get all available moods"""
     try:
-        moods = get_available_moods()
+        moods = await get_cached_catalog("moods")
         return {"moods": moods}
     except Exception as e:
         logger.error(f"Error getting moods: {e}")
-        raise HTTPException(status_code=500, detail="Error retrieving moods")
+        raise api_error(e, "Error retrieving moods")
 
 @app.get("/api/movies/random")
 async def get_random_movies(
     genres: Optional[str] = Query(None, description="Comma-separated list of genres"),
     moods: Optional[str] = Query(None, description="Comma-separated list of moods"),
-    count: int = Query(8, ge=6, le=10, description="Number of movies to return")
+    count: int = Query(8, ge=6, le=10, description="Number of movies to return"),
+    min_rating: float = Query(0.0, ge=0, le=10, description="Minimum rating"),
+    max_rating: Optional[float] = Query(None, ge=0, le=10, description="Maximum rating"),
+    min_year: Optional[int] = Query(None, description="Earliest release year"),
+    max_year: Optional[int] = Query(None, description="Latest release year")
 ):
     """Get random movies for the roulette wheel"""
     try:
@@ -317,49 +1251,67 @@ async def get_random_movies(
         genre_list = genres.split(",") if genres else []
         mood_list = moods.split(",") if moods else []
         
-        # Filter movies
-        filtered_movies = filter_movies(genre_list, mood_list)
-        
-        if not filtered_movies:
-            # If no movies match criteria, return random movies
-            filtered_movies = list(movies_collection.find({}, {"_id": 0}).limit(100))
+        key = filter_key(genre_list, mood_list, min_rating, max_year, max_rating, min_year)
         
-        # Select random movies
-        if len(filtered_movies) < count:
-            selected_movies = filtered_movies
-        else:
-            selected_movies = random.sample(filtered_movies, count)
+        # Serve a pre-shuffled wheel when the producer has one ready
+        if DECKS_ENABLED:
+            deck_tracker.record((key, count))
+            wheel = wheel_decks.pop((key, count))
+            if wheel is not None:
+                return wheel
         
-        return {
-            "movies": selected_movies,
-            "total_available": len(filtered_movies)
-        }
+        # Filter movies and select random ones
+        candidates = await load_wheel_candidates(key)
+        return build_wheel(candidates, count)
         
     except Exception as e:
         logger.error(f"Error getting random movies: {e}")
-        raise HTTPException(status_code=500, detail="Error retrieving random movies")
+        raise api_error(e, "Error retrieving random movies")
+
+@app.get("/api/movies/facets")
+async def get_movie_facets(
+    genres: Optional[str] = Query(None, description="Comma-separated list of genres"),
+    moods: Optional[str] = Query(None, description="Comma-separated list of moods"),
+    min_rating: float = Query(0.0, ge=0, le=10, description="Minimum rating"),
+    max_rating: Optional[float] = Query(None, ge=0, le=10, description="Maximum rating"),
+    min_year: Optional[int] = Query(None, description="Earliest release year"),
+    max_year: Optional[int] = Query(None, description="Latest release year")
+):
+    """Get match counts per genre, mood, rating and decade for the current filter"""
+    try:
+        genre_list = genres.split(",") if genres else []
+        mood_list = moods.split(",") if moods else []
+        
+        index = await get_cached_catalog("facet_index")
+        return index.facets(*filter_key(genre_list, mood_list, min_rating, max_year, max_rating, min_year))
+        
+    except Exception as e:
+        logger.error(f"Error getting movie facets: {e}")
+        raise api_error(e, "Error retrieving movie facets")
 
 @app.get("/api/movies/{movie_id}")
 async def get_movie_details(movie_id: str):
     """Get details for a specific movie"""
     try:
-        movie = movies_collection.find_one({"id": movie_id}, {"_id": 0})
+        movie = await run_blocking(movies_collection.find_one, {"id": movie_id}, {"_id": 0})
         if not movie:
             raise HTTPException(status_code=404, detail="Movie not found")
         return movie
     except Exception as e:
         logger.error(f"Error getting movie details: {e}")
-        raise HTTPException(status_code=500, detail="Error retrieving movie details")
+        raise api_error(e, "Error retrieving movie details")
 
 @app.post("/api/movies/filter")
 async def filter_movies_endpoint(filter_data: MovieFilter):
     """Filter movies based on criteria"""
     try:
-        filtered_movies = filter_movies(
+        filtered_movies = await fetch_filtered_movies(
             filter_data.genres,
             filter_data.moods,
             filter_data.min_rating,
-            filter_data.max_year
+            filter_data.max_year,
+            filter_data.max_rating,
+            filter_data.min_year
         )
         
         return {
@@ -369,7 +1321,7 @@ async def filter_movies_endpoint(filter_data: MovieFilter):
         
     except Exception as e:
         logger.error(f"Error filtering movies: {e}")
-        raise HTTPException(status_code=500, detail="Error filtering movies")
+        raise api_error(e, "Error filtering movies")
 
 @app.post("/api/spin")
 async def save_spin_result(spin_result: SpinResult):
@@ -378,7 +1330,7 @@ async def save_spin_result(spin_result: SpinResult):
         spin_data = spin_result.dict()
         spin_data["timestamp"] = datetime.now()
         
-        result = spins_collection.insert_one(spin_data)
+        await run_blocking(spins_collection.insert_one, spin_data)
         
         return {
             "spin_id": spin_result.spin_id,
@@ -388,46 +1340,41 @@ async def save_spin_result(spin_result: SpinResult):
         
     except Exception as e:
         logger.error(f"Error saving spin result: {e}")
-        raise HTTPException(status_code=500, detail="Error saving spin result")
+        raise api_error(e, "Error saving spin result")
 
 @app.get("/api/spin/{spin_id}")
 async def get_spin_result(spin_id: str):
     """Get a saved spin result"""
     try:
-        spin_result = spins_collection.find_one({"spin_id": spin_id}, {"_id": 0})
+        spin_result = await run_blocking(spins_collection.find_one, {"spin_id": spin_id}, {"_id": 0})
         if not spin_result:
             raise HTTPException(status_code=404, detail="Spin result not found")
         return spin_result
     except Exception as e:
         logger.error(f"Error getting spin result: {e}")
-        raise HTTPException(status_code=500, detail="Error retrieving spin result")
+        raise api_error(e, "Error retrieving spin result")
 
 @app.get("/api/stats")
 async def get_statistics():
     """Get platform statistics"""
     try:
-        total_movies = movies_collection.count_documents({})
-        total_spins = spins_collection.count_documents({})
-        
-        # Get most popular genres
-        genre_pipeline = [
-            {"$unwind": "$genre"},
-            {"$group": {"_id": "$genre", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}},
-            {"$limit": 10}
-        ]
-        popular_genres = list(movies_collection.aggregate(genre_pipeline))
-        
-        return {
-            "total_movies": total_movies,
-            "total_spins": total_spins,
-            "popular_genres": popular_genres
-        }
-        
+        return await singleflight.do(("stats",), compute_statistics)
     except Exception as e:
         logger.error(f"Error getting statistics: {e}")
-        raise HTTPException(status_code=500, detail="Error retrieving statistics")
+        raise api_error(e, "Error retrieving statistics")
+
+# Frontend build, served when bundled alongside the backend (see Dockerfile)
+if os.path.isdir(FRONTEND_BUILD_DIR):
+    @app.get("/{path:path}", include_in_schema=False)
+    async def serve_react(path: str):
+        """Serve static assets, falling back to index.html for client-side routes"""
+        if path.startswith("api/"):
+            raise HTTPException(status_code=404, detail="Not Found")
+        file_path = os.path.realpath(os.path.join(FRONTEND_BUILD_DIR, path))
+        if path and file_path.startswith(os.path.realpath(FRONTEND_BUILD_DIR) + os.sep) and os.path.isfile(file_path):
+            return FileResponse(file_path)
+        return FileResponse(os.path.join(FRONTEND_BUILD_DIR, "index.html"))
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", "8001")))
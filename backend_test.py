@@ -51,6 +51,22 @@ class StreamRouletteAPITester:
             self.log_test("Health Check", False, str(e))
             return False
 
+    def test_readiness_check(self):
+        """Test readiness probe endpoint"""
+        try:
+            response = requests.get(f"{self.base_url}/api/health/ready", timeout=10)
+            success = response.status_code == 200
+            
+            data = response.json()
+            details = f"Status: {data.get('status')}, Checks: {data.get('checks')}, Cold start: {data.get('cold_start_seconds')}s"
+                
+            self.log_test("Readiness Check", success, details)
+            return success
+            
+        except Exception as e:
+            self.log_test("Readiness Check", False, str(e))
+            return False
+
     def test_get_genres(self):
         """Test get genres endpoint"""
         try:
@@ -128,6 +144,32 @@ class StreamRouletteAPITester:
             self.log_test("Get Random Movies", False, str(e))
             return False
 
+    def test_get_movie_facets(self):
+        """Test faceted counts endpoint"""
+        try:
+            response = requests.get(f"{self.base_url}/api/movies/facets?genres=Drama&min_rating=8.0&max_year=2010", timeout=10)
+            success = response.status_code == 200
+            
+            if success:
+                data = response.json()
+                
+                # The facet total must match a real filter query with the same criteria
+                filter_data = {"genres": ["Drama"], "moods": [], "min_rating": 8.0, "max_year": 2010}
+                filter_response = requests.post(f"{self.base_url}/api/movies/filter", json=filter_data, timeout=15)
+                total_count = filter_response.json().get('total_count') if filter_response.status_code == 200 else None
+                
+                success = data.get('total') == total_count and data.get('genres', {}).get('Drama') == total_count
+                details = f"Facet total: {data.get('total')}, Filter total_count: {total_count}, Drama chip: {data.get('genres', {}).get('Drama')}"
+            else:
+                details = f"Status code: {response.status_code}"
+                
+            self.log_test("Get Movie Facets", success, details)
+            return success
+            
+        except Exception as e:
+            self.log_test("Get Movie Facets", False, str(e))
+            return False
+
     def test_get_movie_details(self):
         """Test get movie details endpoint"""
         if not self.sample_movie_id:
@@ -335,12 +377,14 @@ class StreamRouletteAPITester:
         
         # Basic endpoint tests
         self.test_health_check()
+        self.test_readiness_check()
         self.test_get_genres()
         self.test_get_moods()
         self.test_get_statistics()
         
         # Core functionality tests
         self.test_get_random_movies()
+        self.test_get_movie_facets()
         self.test_get_movie_details()
         self.test_filter_movies()
         
@@ -7,12 +7,16 @@ import FilterPanel from './components/FilterPanel';
 import './App.css';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL || 'http://localhost:8001';
+const FACETS_DEBOUNCE_MS = 250;
 
 function App() {
   const [genres, setGenres] = useState([]);
   const [moods, setMoods] = useState([]);
   const [selectedGenres, setSelectedGenres] = useState([]);
   const [selectedMoods, setSelectedMoods] = useState([]);
+  const [ratingRange, setRatingRange] = useState({ min: '', max: '' });
+  const [yearRange, setYearRange] = useState({ min: '', max: '' });
+  const [facets, setFacets] = useState(null);
   const [wheelMovies, setWheelMovies] = useState([]);
   const [selectedMovie, setSelectedMovie] = useState(null);
   const [isSpinning, setIsSpinning] = useState(false);
@@ -28,6 +32,39 @@ function App() {
     loadLastResult();
   }, []);
 
+  useEffect(() => {
+    // Debounce typing in the range inputs and drop responses for superseded filters
+    const controller = new AbortController();
+    const timer = setTimeout(() => loadFacets(controller.signal), FACETS_DEBOUNCE_MS);
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [selectedGenres, selectedMoods, ratingRange, yearRange]);
+
+  const buildFilterParams = () => {
+    const params = new URLSearchParams({
+      genres: selectedGenres.join(','),
+      moods: selectedMoods.join(',')
+    });
+    if (ratingRange.min !== '') params.set('min_rating', ratingRange.min);
+    if (ratingRange.max !== '') params.set('max_rating', ratingRange.max);
+    if (yearRange.min !== '') params.set('min_year', yearRange.min);
+    if (yearRange.max !== '') params.set('max_year', yearRange.max);
+    return params;
+  };
+
+  const loadFacets = async (signal) => {
+    try {
+      const response = await fetch(`${BACKEND_URL}/api/movies/facets?${buildFilterParams()}`, { signal });
+      if (!response.ok) return;
+      const data = await response.json();
+      if (!signal.aborted) setFacets(data);
+    } catch (err) {
+      if (err.name !== 'AbortError') console.error('Failed to load facets:', err);
+    }
+  };
+
   const loadInitialData = async () => {
     try {
       const [genresRes, moodsRes] = await Promise.all([
@@ -78,12 +115,10 @@ function App() {
     setSelectedMovie(null);
     
     try {
-      const genreParam = selectedGenres.length > 0 ? selectedGenres.join(',') : '';
-      const moodParam = selectedMoods.length > 0 ? selectedMoods.join(',') : '';
+      const params = buildFilterParams();
+      params.set('count', 8);
       
-      const response = await fetch(
-        `${BACKEND_URL}/api/movies/random?genres=${genreParam}&moods=${moodParam}&count=8`
-      );
+      const response = await fetch(`${BACKEND_URL}/api/movies/random?${params}`);
       
       if (!response.ok) {
         throw new Error('Failed to fetch movies');
@@ -241,8 +276,13 @@ function App() {
                 moods={moods}
                 selectedGenres={selectedGenres}
                 selectedMoods={selectedMoods}
+                ratingRange={ratingRange}
+                yearRange={yearRange}
+                facets={facets}
                 onGenreChange={setSelectedGenres}
                 onMoodChange={setSelectedMoods}
+                onRatingRangeChange={setRatingRange}
+                onYearRangeChange={setYearRange}
                 onReset={resetSpin}
               />
             </motion.div>
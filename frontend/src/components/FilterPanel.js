@@ -7,8 +7,13 @@ const FilterPanel = ({
   moods, 
   selectedGenres, 
   selectedMoods, 
+  ratingRange,
+  yearRange,
+  facets,
   onGenreChange, 
   onMoodChange, 
+  onRatingRangeChange,
+  onYearRangeChange,
   onReset 
 }) => {
   const handleGenreToggle = (genre) => {
@@ -30,9 +35,29 @@ const FilterPanel = ({
   const clearFilters = () => {
     onGenreChange([]);
     onMoodChange([]);
+    onRatingRangeChange({ min: '', max: '' });
+    onYearRangeChange({ min: '', max: '' });
   };
 
-  const hasFilters = selectedGenres.length > 0 || selectedMoods.length > 0;
+  const hasRanges = ratingRange.min !== '' || ratingRange.max !== '' || yearRange.min !== '' || yearRange.max !== '';
+  const hasFilters = selectedGenres.length > 0 || selectedMoods.length > 0 || hasRanges;
+
+  // Match count for a chip, or null until facets have loaded
+  const facetCount = (group, value) => (facets && facets[group] ? facets[group][value] ?? 0 : null);
+
+  const chipCount = (count) => count !== null && (
+    <span className="ml-2 text-xs opacity-75">{count}</span>
+  );
+
+  const rangeInput = (value, onChange, props) => (
+    <input
+      type="number"
+      value={value}
+      onChange={(e) => onChange(e.target.value)}
+      className="w-24 px-3 py-2 rounded-lg bg-white/10 text-white placeholder-blue-200/50 border border-white/20 focus:outline-none focus:border-purple-400"
+      {...props}
+    />
+  );
 
   return (
     <motion.div
@@ -77,11 +102,12 @@ const FilterPanel = ({
                 selectedGenres.includes(genre)
                   ? 'bg-gradient-to-r from-purple-500 to-pink-500 text-white shadow-lg'
                   : 'bg-white/10 text-blue-100 hover:bg-white/20'
-              }`}
+              } ${facetCount('genres', genre) === 0 && !selectedGenres.includes(genre) ? 'opacity-40' : ''}`}
               whileHover={{ scale: 1.05 }}
               whileTap={{ scale: 0.95 }}
             >
               {genre}
+              {chipCount(facetCount('genres', genre))}
             </motion.button>
           ))}
         </div>
@@ -105,16 +131,48 @@ const FilterPanel = ({
                 selectedMoods.includes(mood)
                   ? 'bg-gradient-to-r from-blue-500 to-cyan-500 text-white shadow-lg'
                   : 'bg-white/10 text-blue-100 hover:bg-white/20'
-              }`}
+              } ${facetCount('moods', mood) === 0 && !selectedMoods.includes(mood) ? 'opacity-40' : ''}`}
               whileHover={{ scale: 1.05 }}
               whileTap={{ scale: 0.95 }}
             >
               {mood}
+              {chipCount(facetCount('moods', mood))}
             </motion.button>
           ))}
         </div>
       </div>
 
+      {/* Rating and Year Ranges */}
+      <div className="mt-6 flex flex-wrap gap-8">
+        <div>
+          <h3 className="text-white font-semibold mb-3 flex items-center space-x-2">
+            <span>⭐</span>
+            <span>Rating</span>
+          </h3>
+          <div className="flex items-center space-x-2 text-blue-100">
+            {rangeInput(ratingRange.min, (min) => onRatingRangeChange({ ...ratingRange, min }), { min: 0, max: 10, step: 0.1, placeholder: 'Min' })}
+            <span>to</span>
+            {rangeInput(ratingRange.max, (max) => onRatingRangeChange({ ...ratingRange, max }), { min: 0, max: 10, step: 0.1, placeholder: 'Max' })}
+          </div>
+        </div>
+        <div>
+          <h3 className="text-white font-semibold mb-3 flex items-center space-x-2">
+            <span>📅</span>
+            <span>Year</span>
+          </h3>
+          <div className="flex items-center space-x-2 text-blue-100">
+            {rangeInput(yearRange.min, (min) => onYearRangeChange({ ...yearRange, min }), { step: 1, placeholder: 'From' })}
+            <span>to</span>
+            {rangeInput(yearRange.max, (max) => onYearRangeChange({ ...yearRange, max }), { step: 1, placeholder: 'To' })}
+          </div>
+        </div>
+        {facets && (
+          <div className="self-end text-blue-200 text-sm pb-2">
+            {facets.total} {facets.total === 1 ? 'movie matches' : 'movies match'}
+          </div>
+        )}
+      </div>
+
       {/* Active Filters Summary */}
       {hasFilters && (
         <motion.div
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# server.py and its helpers are imported as top-level modules from backend/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+from server import ConcurrencyLimiter, TokenBucketLimiter
+
+
+def test_token_bucket_allows_burst_then_rejects():
+    limiter = TokenBucketLimiter(rate=1, burst=2, max_clients=10)
+    assert limiter.acquire("a") == 0
+    assert limiter.acquire("a") == 0
+    wait = limiter.acquire("a")
+    assert 0 < wait <= 1
+    assert limiter.rejected == 1
+    # Other clients have their own bucket
+    assert limiter.acquire("b") == 0
+
+
+def test_token_bucket_keeps_only_recent_clients():
+    limiter = TokenBucketLimiter(rate=1, burst=1, max_clients=2)
+    for client in ("a", "b", "c"):
+        limiter.acquire(client)
+    assert list(limiter._buckets) == ["b", "c"]
+
+
+def test_token_bucket_zero_rate_disables_limiting():
+    limiter = TokenBucketLimiter(rate=0, burst=0, max_clients=10)
+    assert all(limiter.acquire("a") == 0 for _ in range(100))
+    assert limiter.rejected == 0
+
+
+def test_concurrency_limiter_sheds_after_queue_budget():
+    async def main():
+        limiter = ConcurrencyLimiter(limit=1, queue_budget=0.01)
+        assert await limiter.acquire(limiter.queue_budget)
+        assert not await limiter.acquire(limiter.queue_budget)
+        limiter.release()
+        assert await limiter.acquire(limiter.queue_budget)
+        return limiter.metrics()
+
+    metrics = asyncio.run(main())
+    assert metrics["admitted"] == 2
+    assert metrics["shed"] == 1
+    assert metrics["in_flight"] == 1
+    assert metrics["waiting"] == 0
+
+
+@pytest.fixture
+def limiters(monkeypatch):
+    monkeypatch.setattr(server, "rate_limiter", TokenBucketLimiter(rate=1000, burst=1000, max_clients=10))
+    route_limiters = {name: ConcurrencyLimiter(limit, budget) for name, (limit, budget) in server.ROUTE_CLASS_LIMITS.items()}
+    monkeypatch.setattr(server, "route_limiters", route_limiters)
+    return route_limiters
+
+
+def test_rate_limited_requests_get_429(monkeypatch, limiters):
+    monkeypatch.setattr(server, "rate_limiter", TokenBucketLimiter(rate=0.5, burst=0, max_clients=10))
+    response = TestClient(server.app).get("/api/stats")
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "2"
+
+
+def test_low_priority_shed_while_spins_queue(limiters):
+    limiters["spin"].waiting = 1
+    response = TestClient(server.app).get("/api/stats")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(server.RETRY_AFTER_SECONDS)
+    assert limiters["heavy"].shed == 1
+
+
+def test_requests_over_queue_budget_get_503(monkeypatch, limiters):
+    limiters["heavy"] = ConcurrencyLimiter(limit=0, queue_budget=0.01)
+    response = TestClient(server.app).post("/api/movies/filter", json={})
+    assert response.status_code == 503
+    assert "retry-after" in response.headers
+
+
+def test_probes_bypass_admission(monkeypatch, limiters):
+    monkeypatch.setattr(server, "rate_limiter", TokenBucketLimiter(rate=0.5, burst=0, max_clients=10))
+    assert TestClient(server.app).get("/api/health/live").status_code == 200
+
+
+def test_client_id_uses_proxy_appended_entry(monkeypatch):
+    class FakeRequest:
+        headers = {"x-forwarded-for": "6.6.6.6, 1.2.3.4"}
+        client = type("Client", (), {"host": "10.0.0.1"})()
+
+    monkeypatch.setattr(server, "TRUSTED_PROXY_HOPS", 1)
+    assert server.client_id_for(FakeRequest()) == "1.2.3.4"
+    monkeypatch.setattr(server, "TRUSTED_PROXY_HOPS", 0)
+    assert server.client_id_for(FakeRequest()) == "10.0.0.1"
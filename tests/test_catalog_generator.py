@@ -0,0 +1,74 @@
+import pytest
+from pymongo.errors import BulkWriteError
+
+from catalog_generator import CatalogGenerator, insert_in_batches, next_movie_id
+
+
+def test_movies_are_deterministic_per_index():
+    generator = CatalogGenerator(seed=7)
+    movies = list(generator.movies(50))
+    assert movies[10] == CatalogGenerator(seed=7).movie(10)
+    assert [movie["id"] for movie in movies[:3]] == ["1", "2", "3"]
+
+
+def test_streams_do_not_collide_across_seeds_and_indexes():
+    # (seed, index) pairs an arithmetic seed combination could map to the same sequence
+    assert CatalogGenerator(seed=0)._rng(0, 1_000_003).random() != CatalogGenerator(seed=1)._rng(0, 0).random()
+    assert CatalogGenerator(seed=0)._rng(1, 0).random() != CatalogGenerator(seed=0)._rng(0, 1).random()
+
+
+def test_genres_are_skewed_toward_the_head_of_the_vocabulary():
+    movies = list(CatalogGenerator(seed=1).movies(2000))
+    drama = sum("Drama" in movie["genre"] for movie in movies)
+    western = sum("Western" in movie["genre"] for movie in movies)
+    assert drama > 5 * western
+
+
+def test_spins_reference_generated_movies():
+    generator = CatalogGenerator(seed=3)
+    spin = generator.spin(0, catalog_size=100)
+    assert len(spin["wheel_movies"]) == 8
+    assert spin["selected_movie"] in spin["wheel_movies"]
+    assert list(generator.spins(5, catalog_size=0)) == []
+
+
+class FakeCollection:
+    """Records bulk inserts and answers the max-id aggregation"""
+
+    def __init__(self, max_id=None):
+        self.max_id = max_id
+        self.batches = []
+
+    def aggregate(self, pipeline):
+        return [] if self.max_id is None else [{"_id": None, "max_id": self.max_id}]
+
+    def insert_many(self, documents, ordered=True):
+        self.batches.append(documents)
+
+
+def test_next_movie_id_continues_after_existing_catalog():
+    assert next_movie_id(FakeCollection()) == 1
+    assert next_movie_id(FakeCollection(max_id=20)) == 21
+
+
+def test_insert_in_batches_streams_bounded_batches():
+    collection = FakeCollection()
+    written = insert_in_batches(collection, CatalogGenerator(start_id=21).movies(5), batch_size=2)
+    assert written == 5
+    assert [len(batch) for batch in collection.batches] == [2, 2, 1]
+    assert collection.batches[0][0]["id"] == "21"
+
+
+def test_insert_in_batches_can_skip_duplicate_ids():
+    class DuplicateRejectingCollection(FakeCollection):
+        def insert_many(self, documents, ordered=True):
+            super().insert_many(documents, ordered)
+            if len(self.batches) == 1:
+                raise BulkWriteError({"writeErrors": [{"index": 0, "code": 11000}], "nInserted": len(documents) - 1})
+
+    movies = CatalogGenerator().movies(4)
+    with pytest.raises(BulkWriteError):
+        insert_in_batches(DuplicateRejectingCollection(), movies, batch_size=2)
+    written = insert_in_batches(DuplicateRejectingCollection(), CatalogGenerator().movies(4), batch_size=2,
+                                skip_duplicates=True)
+    assert written == 3
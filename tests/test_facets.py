@@ -0,0 +1,77 @@
+import pytest
+
+from catalog_generator import CatalogGenerator
+from server import FacetIndex, filter_key
+
+MOVIES = list(CatalogGenerator(seed=11).movies(400)) + [
+    {"id": "edge-1", "genre": ["Drama"], "mood": ["Dark"], "rating": 7.2, "year": 1999},
+    {"id": "edge-2", "genre": ["Drama"], "mood": ["Dark"], "rating": 7.3, "year": 2000},
+]
+INDEX = FacetIndex(MOVIES)
+
+
+def matches(movie, genres=(), moods=(), min_rating=0.0, max_year=None, max_rating=None, min_year=None):
+    """Brute-force equivalent of the Mongo query built by filter_movies"""
+    return (
+        (not genres or any(genre in genres for genre in movie["genre"]))
+        and (not moods or any(mood in moods for mood in movie["mood"]))
+        and (not min_rating or movie["rating"] >= min_rating)
+        and (max_rating is None or movie["rating"] <= max_rating)
+        and (not min_year or movie["year"] >= min_year)
+        and (not max_year or movie["year"] <= max_year)
+    )
+
+
+def brute_force_facets(genres, moods, min_rating, max_year, max_rating, min_year):
+    def count(**criteria):
+        merged = {"genres": genres, "moods": moods, "min_rating": min_rating, "max_year": max_year,
+                  "max_rating": max_rating, "min_year": min_year, **criteria}
+        return [movie for movie in MOVIES if matches(movie, **merged)]
+
+    return {
+        "total": len(count()),
+        "genres": {genre: sum(genre in m["genre"] for m in count(genres=())) for genre in INDEX.genres},
+        "moods": {mood: sum(mood in m["mood"] for m in count(moods=())) for mood in INDEX.moods},
+        "rating_histogram": {
+            bucket: sum(bucket <= m["rating"] < bucket + 1 for m in count(min_rating=0.0, max_rating=None))
+            for bucket in INDEX.rating_buckets
+        },
+        "year_histogram": {
+            bucket: sum(bucket <= m["year"] < bucket + 10 for m in count(min_year=None, max_year=None))
+            for bucket in INDEX.year_buckets
+        },
+    }
+
+
+@pytest.mark.parametrize("criteria", [
+    {},
+    {"genres": ["Drama"]},
+    {"genres": ["Drama", "Comedy"], "moods": ["Dark"]},
+    {"min_rating": 7.25},
+    {"max_rating": 7.25},
+    {"min_rating": 7.2, "max_rating": 7.3},
+    {"min_rating": 6.05, "max_rating": 8.95, "min_year": 1990, "max_year": 2009},
+    {"genres": ["Drama"], "moods": ["Dark", "Emotional"], "min_year": 2000, "max_rating": 7.0},
+])
+def test_facets_match_brute_force(criteria):
+    key = filter_key(criteria.get("genres"), criteria.get("moods"), criteria.get("min_rating", 0.0),
+                     criteria.get("max_year"), criteria.get("max_rating"), criteria.get("min_year"))
+    facets = INDEX.facets(*key)
+    expected = brute_force_facets(*key)
+    assert facets["total"] == expected["total"]
+    assert facets["genres"] == expected["genres"]
+    assert facets["moods"] == expected["moods"]
+    assert {b["min"]: b["count"] for b in facets["rating_histogram"]} == expected["rating_histogram"]
+    assert {b["min"]: b["count"] for b in facets["year_histogram"]} == expected["year_histogram"]
+
+
+def test_rating_bound_between_tenths_matches_mongo():
+    edges = FacetIndex(MOVIES[-2:])
+    assert edges.facets((), (), 7.25, None, None, None)["total"] == 1
+    assert edges.facets((), (), 0.0, None, 7.25, None)["total"] == 1
+
+
+def test_histogram_buckets_are_half_open():
+    facets = INDEX.facets((), (), 0.0, None, None, None)
+    assert all(b["max"] == b["min"] + 1 for b in facets["rating_histogram"])
+    assert all(b["max"] == b["min"] + 10 for b in facets["year_histogram"])
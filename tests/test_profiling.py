@@ -0,0 +1,60 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+
+
+def test_signature_accepted_until_it_expires(monkeypatch):
+    monkeypatch.setattr(server, "PROFILE_SECRET", "secret")
+    expires = int(time.time()) + 60
+    signature = server.profile_signature("GET", "/api/genres", expires)
+    assert server.valid_profile_signature(signature, "GET", "/api/genres")
+    assert not server.valid_profile_signature(signature, "GET", "/api/stats")
+
+
+def test_expired_or_long_lived_signatures_rejected(monkeypatch):
+    monkeypatch.setattr(server, "PROFILE_SECRET", "secret")
+    expired = server.profile_signature("GET", "/api/genres", int(time.time()) - 1)
+    too_long = server.profile_signature("GET", "/api/genres", int(time.time()) + server.PROFILE_SIGNATURE_MAX_TTL + 60)
+    assert not server.valid_profile_signature(expired, "GET", "/api/genres")
+    assert not server.valid_profile_signature(too_long, "GET", "/api/genres")
+    assert not server.valid_profile_signature("garbage", "GET", "/api/genres")
+
+
+def test_tampered_expiry_rejected(monkeypatch):
+    monkeypatch.setattr(server, "PROFILE_SECRET", "secret")
+    expires = int(time.time()) + 60
+    _, digest = server.profile_signature("GET", "/api/genres", expires).split(":")
+    assert not server.valid_profile_signature(f"{expires + 30}:{digest}", "GET", "/api/genres")
+
+
+def test_prune_keeps_newest_profiles(monkeypatch, tmp_path):
+    monkeypatch.setattr(server, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(server, "PROFILE_MAX_FILES", 2)
+    for i in range(4):
+        path = tmp_path / f"profile-{i}.txt"
+        path.write_text("x")
+        server.os.utime(path, (1000 + i, 1000 + i))
+    (tmp_path / "notes.md").write_text("keep")
+    server.prune_profiles()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["notes.md", "profile-2.txt", "profile-3.txt"]
+
+
+def test_profile_records_worker_thread_calls(monkeypatch, tmp_path):
+    pytest.importorskip("pyinstrument")
+
+    def load_slow_genres():
+        time.sleep(0.05)
+        return ["Drama"]
+
+    monkeypatch.setattr(server, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(server, "PROFILE_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(server, "CATALOG_CACHE_LOADERS", {"genres": load_slow_genres})
+    monkeypatch.setattr(server, "catalog_cache", {})
+    monkeypatch.setattr(server, "rate_limiter", server.TokenBucketLimiter(rate=1000, burst=1000, max_clients=10))
+    response = TestClient(server.app).get("/api/genres")
+    assert response.json() == {"genres": ["Drama"]}
+    profile = (tmp_path / response.headers["x-profile-id"]).read_text()
+    assert "load_slow_genres" in profile
@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from server import SingleFlight
+
+
+def slow_double(value, calls, release=None):
+    calls.append(value)
+    if release is not None:
+        release.wait(5)
+    else:
+        time.sleep(0.05)
+    return value * 2
+
+
+def test_concurrent_callers_share_one_call():
+    singleflight = SingleFlight()
+    calls = []
+
+    async def main():
+        return await asyncio.gather(*[singleflight.do(("k", 1), slow_double, 3, calls) for _ in range(10)])
+
+    assert asyncio.run(main()) == [6] * 10
+    assert calls == [3]
+    metrics = singleflight.metrics()
+    assert metrics["calls"] == 1
+    assert metrics["coalesced"] == 9
+    assert metrics["coalesced_by_kind"] == {"k": 9}
+    assert metrics["in_flight"] == 0
+
+
+def test_different_keys_do_not_coalesce():
+    singleflight = SingleFlight()
+    calls = []
+
+    async def main():
+        return await asyncio.gather(
+            singleflight.do(("k", 1), slow_double, 1, calls),
+            singleflight.do(("k", 2), slow_double, 2, calls),
+        )
+
+    assert asyncio.run(main()) == [2, 4]
+    assert sorted(calls) == [1, 2]
+
+
+def test_errors_reach_every_caller():
+    singleflight = SingleFlight()
+
+    def fail():
+        time.sleep(0.05)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(*[singleflight.do(("fail",), fail) for _ in range(3)], return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert singleflight.metrics()["in_flight"] == 0
+
+
+def test_cancelling_first_caller_does_not_cancel_waiters():
+    singleflight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    async def main():
+        first = asyncio.ensure_future(singleflight.do(("k",), slow_double, 5, calls, release))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(singleflight.do(("k",), slow_double, 5, calls, release))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == 10
+    assert calls == [5]
+    assert singleflight.metrics()["in_flight"] == 0
@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+from server import SlowQueryListener
+
+
+def started(request_id, name, command):
+    return SimpleNamespace(request_id=request_id, command_name=name, database_name="streamroulette",
+                           command={name: command.pop("target", "movies"), **command})
+
+
+def finished(request_id, name, duration_ms, failure=None):
+    return SimpleNamespace(request_id=request_id, command_name=name, duration_micros=int(duration_ms * 1000),
+                           failure=failure)
+
+
+def test_records_slow_commands_of_any_kind():
+    listener = SlowQueryListener(threshold_ms=100, explain=False, log_size=10)
+    listener.started(started(1, "find", {"filter": {"genre": {"$in": ["Drama"]}}}))
+    listener.started(started(2, "getMore", {"target": 12345, "collection": "movies"}))
+    listener.started(started(3, "delete", {"deletes": [{"q": {"id": "7"}, "limit": 1}]}))
+    listener.started(started(4, "insert", {"documents": [{"id": "8"}]}))
+    listener.succeeded(finished(1, "find", 150))
+    listener.succeeded(finished(2, "getMore", 300))
+    listener.succeeded(finished(3, "delete", 120))
+    listener.succeeded(finished(4, "insert", 20))
+
+    entries = {entry["command"]: entry for entry in listener.recent}
+    assert set(entries) == {"find", "getMore", "delete"}
+    assert entries["find"]["shape"] == {"genre": {"$in": ["str"]}}
+    assert entries["getMore"]["collection"] == "movies"
+    assert entries["getMore"]["shape"] is None
+    assert entries["delete"]["shape"] == [{"q": {"id": "str"}, "limit": "int"}]
+    assert not listener._started
+
+
+def test_records_slow_failures():
+    listener = SlowQueryListener(threshold_ms=100, explain=False, log_size=10)
+    listener.started(started(1, "aggregate", {"pipeline": [{"$sample": {"size": 8}}]}))
+    listener.started(started(2, "find", {"filter": {}}))
+    listener.failed(finished(1, "aggregate", 5000, failure={"errmsg": "operation exceeded time limit"}))
+    listener.failed(finished(2, "find", 3, failure={"errmsg": "bad query"}))
+
+    [entry] = listener.recent
+    assert entry["command"] == "aggregate"
+    assert entry["error"] == "operation exceeded time limit"
+    assert not listener._started
+
+
+def test_explains_only_explainable_commands(monkeypatch):
+    listener = SlowQueryListener(threshold_ms=100, explain=True, log_size=10)
+    explained = []
+    monkeypatch.setattr(listener, "_explainer", SimpleNamespace(submit=lambda fn, *args: explained.append(args[2]["command"])))
+    listener.started(started(1, "getMore", {"target": 12345, "collection": "movies"}))
+    listener.started(started(2, "count", {"query": {}}))
+    listener.succeeded(finished(1, "getMore", 300))
+    listener.succeeded(finished(2, "count", 300))
+    assert explained == ["count"]
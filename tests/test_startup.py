@@ -0,0 +1,96 @@
+import asyncio
+
+from pymongo.errors import BulkWriteError
+
+import server
+
+
+class FakeMovies:
+    """Movies collection keyed by _id, rejecting duplicates like Mongo's unordered inserts"""
+
+    def __init__(self, documents=()):
+        self.documents = {document["_id"]: document for document in documents}
+
+    def find_one(self, query, projection=None):
+        return next(iter(self.documents.values()), None)
+
+    def insert_many(self, documents, ordered=True):
+        errors = []
+        for index, document in enumerate(documents):
+            if document["_id"] in self.documents:
+                errors.append({"index": index, "code": 11000, "errmsg": "duplicate key"})
+            else:
+                self.documents[document["_id"]] = document
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": len(documents) - len(errors)})
+
+
+def test_warm_up_retries_until_it_succeeds(monkeypatch):
+    attempts = []
+
+    def flaky_seed():
+        attempts.append("seed")
+        if len(attempts) < 3:
+            raise RuntimeError("mongo not up yet")
+
+    async def warm_catalog_cache():
+        attempts.append("warm")
+
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(server, "SEED_DATABASE", True)
+    monkeypatch.setattr(server, "initialize_database", flaky_seed)
+    monkeypatch.setattr(server, "warm_catalog_cache", warm_catalog_cache)
+    monkeypatch.setattr(server.asyncio, "sleep", no_sleep)
+    monkeypatch.setattr(server, "startup_state", {"warmed": False, "cold_start_seconds": None})
+
+    asyncio.run(server.warm_up())
+
+    assert attempts == ["seed", "seed", "seed", "warm"]
+    assert server.startup_state["warmed"]
+
+
+def test_warm_up_does_not_reseed_when_only_cache_warming_failed(monkeypatch):
+    seeds = []
+    warms = []
+
+    async def flaky_warm():
+        warms.append(1)
+        if len(warms) < 2:
+            raise RuntimeError("server selection timeout")
+
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(server, "SEED_DATABASE", True)
+    monkeypatch.setattr(server, "initialize_database", lambda: seeds.append(1))
+    monkeypatch.setattr(server, "warm_catalog_cache", flaky_warm)
+    monkeypatch.setattr(server.asyncio, "sleep", no_sleep)
+    monkeypatch.setattr(server, "startup_state", {"warmed": False, "cold_start_seconds": None})
+
+    asyncio.run(server.warm_up())
+
+    assert len(seeds) == 1
+    assert len(warms) == 2
+    assert server.startup_state["warmed"]
+
+
+def test_seeding_leaves_a_populated_catalog_alone(monkeypatch):
+    existing = FakeMovies([{"_id": "generated-1", "id": "generated-1"}])
+    monkeypatch.setattr(server, "movies_collection", existing)
+    server.initialize_database()
+    assert list(existing.documents) == ["generated-1"]
+
+
+def test_concurrent_seeds_do_not_duplicate_the_catalog(monkeypatch):
+    movies = FakeMovies()
+    monkeypatch.setattr(server, "movies_collection", movies)
+    monkeypatch.setattr(server, "SEED_CATALOG_SIZE", 30)
+    server.initialize_database()
+    assert len(movies.documents) == 30
+
+    # A replica that checked for an empty collection just before the first seed finished
+    monkeypatch.setattr(movies, "find_one", lambda query, projection=None: None)
+    server.initialize_database()
+    assert len(movies.documents) == 30
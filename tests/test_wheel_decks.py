@@ -0,0 +1,135 @@
+import asyncio
+
+import server
+from server import TopKeyTracker, WheelDecks
+
+
+def test_tracker_ranks_keys_by_count():
+    tracker = TopKeyTracker(capacity=4)
+    for key, hits in (("a", 3), ("b", 1), ("c", 2)):
+        for _ in range(hits):
+            tracker.record(key)
+    assert tracker.top(2) == ["a", "c"]
+
+
+def test_tracker_requires_min_count():
+    tracker = TopKeyTracker(capacity=4)
+    tracker.record("once")
+    for _ in range(5):
+        tracker.record("hot")
+    assert tracker.top(10, min_count=5) == ["hot"]
+
+
+def test_tracker_evicts_least_frequent_key():
+    tracker = TopKeyTracker(capacity=2)
+    for _ in range(3):
+        tracker.record("a")
+    tracker.record("b")
+    tracker.record("c")
+    assert set(tracker._counts) == {"a", "c"}
+    # The newcomer inherits the evicted count as its error bound
+    assert tracker._counts["c"] == 2
+
+
+def test_tracker_decay_halves_and_drops_cold_keys():
+    tracker = TopKeyTracker(capacity=4)
+    for _ in range(4):
+        tracker.record("a")
+    tracker.record("b")
+    tracker.decay()
+    assert tracker._counts == {"a": 2}
+
+
+def test_decks_pop_in_order_and_count_hits(monkeypatch):
+    monkeypatch.setattr(server, "catalog_version", 1)
+    decks = WheelDecks(queue_size=2)
+    decks.push("k", 1, {"n": 1})
+    decks.push("k", 1, {"n": 2})
+    assert decks.missing("k") == 0
+    assert decks.pop("k") == {"n": 1}
+    assert decks.pop("k") == {"n": 2}
+    assert decks.pop("k") is None
+    assert (decks.hits, decks.misses) == (2, 1)
+
+
+def test_decks_discard_wheels_from_old_catalog(monkeypatch):
+    monkeypatch.setattr(server, "catalog_version", 1)
+    decks = WheelDecks(queue_size=4)
+    decks.push("k", 1, {"n": 1})
+    decks.push("k", 1, {"n": 2})
+    monkeypatch.setattr(server, "catalog_version", 2)
+    assert decks.pop("k") is None
+    assert decks.discarded == 2
+    assert decks.missing("k") == 4
+
+
+def test_decks_retain_only_hot_keys():
+    decks = WheelDecks(queue_size=2)
+    decks.push("hot", 0, {})
+    decks.push("cold", 0, {})
+    decks.retain({"hot"})
+    assert decks.metrics()["keys"] == 1
+    assert decks.discarded == 1
+
+
+def hot_tracker(key, hits):
+    tracker = TopKeyTracker(capacity=4)
+    for _ in range(hits):
+        tracker.record(key)
+    return tracker
+
+
+def test_refill_reuses_candidates_until_catalog_changes(monkeypatch):
+    deck_key = (((), (), 0.0, None, None, None), 2)
+    loads = []
+
+    async def load_wheel_candidates(key):
+        loads.append(key)
+        return [{"id": str(i)} for i in range(5)]
+
+    monkeypatch.setattr(server, "load_wheel_candidates", load_wheel_candidates)
+    monkeypatch.setattr(server, "deck_tracker", hot_tracker(deck_key, server.DECK_MIN_HITS))
+    monkeypatch.setattr(server, "wheel_decks", WheelDecks(queue_size=2))
+    monkeypatch.setattr(server, "catalog_version", 1)
+    cache = {}
+
+    async def drain_and_refill():
+        while server.wheel_decks.pop(deck_key):
+            pass
+        await server.refill_wheel_decks(cache)
+
+    for _ in range(3):
+        asyncio.run(drain_and_refill())
+    assert len(loads) == 1
+    assert server.wheel_decks.missing(deck_key) == 0
+
+    monkeypatch.setattr(server, "catalog_version", 2)
+    asyncio.run(drain_and_refill())
+    assert len(loads) == 2
+    assert list(cache) == [(deck_key[0], 2)]
+
+
+def test_steady_key_keeps_its_deck_across_decay(monkeypatch):
+    deck_key = ("steady", 8)
+    hits_per_interval = server.DECK_MIN_HITS * 2 - 1
+
+    async def load_wheel_candidates(key):
+        return [{"id": "1"}]
+
+    monkeypatch.setattr(server, "load_wheel_candidates", load_wheel_candidates)
+    monkeypatch.setattr(server, "deck_tracker", hot_tracker(deck_key, hits_per_interval))
+    monkeypatch.setattr(server, "wheel_decks", WheelDecks(queue_size=2))
+    asyncio.run(server.refill_wheel_decks({}))
+    assert deck_key in server.wheel_decks
+
+    server.deck_tracker.decay()
+    assert server.deck_tracker.count(deck_key) < server.DECK_MIN_HITS
+    asyncio.run(server.refill_wheel_decks({}))
+    assert deck_key in server.wheel_decks
+
+    # A key with that few hits does not get a new deck
+    newcomer = ("newcomer", 8)
+    for _ in range(server.deck_tracker.count(deck_key)):
+        server.deck_tracker.record(newcomer)
+    asyncio.run(server.refill_wheel_decks({}))
+    assert newcomer not in server.wheel_decks